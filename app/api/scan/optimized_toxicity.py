@@ -0,0 +1,65 @@
+"""
+Toxicity scanner backed by the O4 graph-optimized detoxify export (fused LayerNorm/GeLU/attention,
+FP16 weights): ~2.5x the throughput of the stock ONNX model at half the size on disk.
+Falls back to the stock ONNX scanner whenever the export can't stand in for it.
+"""
+from typing import Any, Dict, List
+from llm_guard.input_scanners import Toxicity
+from llm_guard.input_scanners.toxicity import DEFAULT_MODEL, MatchType, _toxic_labels
+
+OPTIMIZED_TOXICITY_MODEL = "dcferreira/detoxify-optimized"
+# ORTOptimizer's output name; named explicitly so a repo holding several exports can't pick another
+OPTIMIZED_TOXICITY_FILE = "model_optimized.onnx"
+
+class OptimizedToxicity(Toxicity):
+    """
+    Toxicity scanner running a prebuilt pipeline. Skips Toxicity.__init__, which would
+    download and load the stock model only for it to be replaced.
+    """
+    def __init__(self, pipeline: Any, *, threshold: float = 0.5, match_type: MatchType = MatchType.FULL):
+        self._threshold = threshold
+        self._match_type = match_type
+        self._pipeline = pipeline
+
+def missing_toxic_labels(id2label: Dict[int, str]) -> List[str]:
+    """
+    Returns the labels Toxicity.scan counts as toxic that the model doesn't score. Labels aren't
+    renamed: a differently trained head (e.g. Jigsaw's "toxic") has different score semantics.
+    """
+    labels = set(id2label.values())
+    return [label for label in _toxic_labels if label not in labels]
+
+def load_optimized_model() -> Any:
+    from optimum.onnxruntime import ORTModelForSequenceClassification
+    return ORTModelForSequenceClassification.from_pretrained(
+        OPTIMIZED_TOXICITY_MODEL, file_name=OPTIMIZED_TOXICITY_FILE
+    )
+
+def build_pipeline(model: Any) -> Any:
+    from optimum.pipelines import pipeline
+    from transformers import AutoTokenizer
+    return pipeline(
+        task="text-classification",
+        model=model,
+        tokenizer=AutoTokenizer.from_pretrained(OPTIMIZED_TOXICITY_MODEL),
+        accelerator="ort",
+        # Same settings as the stock model: max_length=512, no token_type_ids, sigmoid over all labels.
+        # The ORT session already picks its execution provider, so llm_guard's torch device is dropped.
+        **{k: v for k, v in DEFAULT_MODEL.pipeline_kwargs.items() if k != "device"},
+    )
+
+def load_toxicity_scanner() -> Toxicity:
+    """
+    Returns an OptimizedToxicity over the optimized export if it loads and scores every label
+    Toxicity counts, otherwise the stock ONNX Toxicity scanner. Never raises for the export, so
+    a problem with it can't take the other scanners down at import.
+    """
+    try:
+        model = load_optimized_model()
+        missing = missing_toxic_labels(model.config.id2label)
+        if missing:
+            raise ValueError(f"{OPTIMIZED_TOXICITY_MODEL} doesn't score {', '.join(missing)}")
+        return OptimizedToxicity(build_pipeline(model))
+    except Exception as e:
+        print(f"Optimized toxicity model unavailable, using the stock ONNX model: {e}")
+        return Toxicity(use_onnx=True)
@@ -16,16 +16,28 @@ import os
 
 # Add the current directory to Python path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from optimized_toxicity import load_toxicity_scanner
 
 # Initialize scanners once
 guard = Guard()
 anonymizer = Anonymize(use_onnx=True)
 secrets_scanner = Secrets()
-toxicity_scanner = Toxicity(use_onnx=True)
+
+toxicity_scanner = load_toxicity_scanner()
 ban_substrings_scanner = BanSubstrings(substrings=["Project Chimera", "Q4_Roadmap_Internal_Draft"])
 regex_scanner = Regex(patterns=[r"INTDOC-\d{6}-[A-Z]{3}"])
 code_scanner = Code()
 
+# Scanner lookup by request name
+SCANNERS = {
+    'anonymize': anonymizer,
+    'secrets': secrets_scanner,
+    'toxicity': toxicity_scanner,
+    'bansubstrings': ban_substrings_scanner,
+    'regex': regex_scanner,
+    'code': code_scanner,
+}
+
 def POST(request):
     try:
         body = request.json()
@@ -44,46 +56,34 @@ def POST(request):
 
         # Process each scanner in order
         for scanner_name in scanners:
-            scanner_result = {
-                'scanner_name': scanner_name,
-                'input_prompt': current_prompt,
-                'sanitized_prompt': current_prompt,
-                'is_valid': True,
-                'risk_score': 0.0,
-                'details': {}
-            }
+            scanner_instance = SCANNERS.get(scanner_name)
+            if scanner_instance is None:
+                continue
 
+            # Build each result in one go; llm_guard scanners already return a float risk score
             try:
-                if scanner_name == 'anonymize':
-                    sanitized, is_valid, risk_score = anonymizer.scan(current_prompt)
-                elif scanner_name == 'secrets':
-                    sanitized, is_valid, risk_score = secrets_scanner.scan(current_prompt)
-                elif scanner_name == 'toxicity':
-                    sanitized, is_valid, risk_score = toxicity_scanner.scan(current_prompt)
-                elif scanner_name == 'bansubstrings':
-                    sanitized, is_valid, risk_score = ban_substrings_scanner.scan(current_prompt)
-                elif scanner_name == 'regex':
-                    sanitized, is_valid, risk_score = regex_scanner.scan(current_prompt)
-                elif scanner_name == 'code':
-                    sanitized, is_valid, risk_score = code_scanner.scan(current_prompt)
-                else:
-                    continue
-
-                scanner_result.update({
+                sanitized, is_valid, risk_score = scanner_instance.scan(current_prompt)
+                scanner_result = {
+                    'scanner_name': scanner_name,
+                    'input_prompt': current_prompt,
                     'sanitized_prompt': sanitized,
                     'is_valid': is_valid,
-                    'risk_score': float(risk_score)
-                })
+                    'risk_score': risk_score,
+                    'details': {}
+                }
                 current_prompt = sanitized
                 if not is_valid:
                     overall_is_valid = False
 
             except Exception as e:
-                scanner_result.update({
+                scanner_result = {
+                    'scanner_name': scanner_name,
+                    'input_prompt': current_prompt,
+                    'sanitized_prompt': current_prompt,
                     'is_valid': False,
                     'risk_score': 1.0,
                     'details': {'error': str(e)}
-                })
+                }
                 overall_is_valid = False
 
             applied_scanners_results.append(scanner_result)
@@ -113,8 +113,10 @@ def POST(request):
         self.end_headers()
 
 # Example of how to test this locally (not for Vercel deployment itself)
+# ThreadingHTTPServer handles each request on its own thread, so one slow client doesn't stall
+# the rest and concurrent scans can overlap while the ONNX kernels release the GIL.
 # if __name__ == '__main__':
-#     from http.server import HTTPServer
-#     server = HTTPServer(('localhost', 8000), handler)
+#     from http.server import ThreadingHTTPServer
+#     server = ThreadingHTTPServer(('localhost', 8000), handler)
 #     print('Starting server on http://localhost:8000')
 #     server.serve_forever() 
\ No newline at end of file
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# route.py imports its sibling modules by putting its own directory on the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
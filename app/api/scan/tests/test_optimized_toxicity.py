@@ -0,0 +1,86 @@
+from types import SimpleNamespace
+
+import pytest
+
+toxicity = pytest.importorskip("llm_guard.input_scanners.toxicity")
+
+import optimized_toxicity
+
+UNBIASED_LABELS = dict(enumerate(toxicity._toxic_labels + ["female", "muslim"]))
+JIGSAW_LABELS = dict(enumerate(["toxic", "severe_toxic", "obscene", "threat", "insult", "identity_hate"]))
+
+# Canned pipeline output per input: one toxic prompt, one borderline, one identity-only mention
+PIPELINE_OUTPUT = {
+    "you are an idiot": [
+        {"label": "toxicity", "score": 0.97},
+        {"label": "insult", "score": 0.91},
+        {"label": "female", "score": 0.02},
+    ],
+    "that was a stupid movie": [
+        {"label": "toxicity", "score": 0.42},
+        {"label": "insult", "score": 0.12},
+    ],
+    "she is a muslim woman": [
+        {"label": "toxicity", "score": 0.05},
+        {"label": "muslim", "score": 0.93},
+    ],
+}
+
+
+def fake_pipeline(inputs, **kwargs):
+    return [PIPELINE_OUTPUT[text] for text in inputs]
+
+
+def fake_model(id2label):
+    return SimpleNamespace(config=SimpleNamespace(id2label=id2label))
+
+
+class StockToxicity:
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+
+
+def test_unbiased_labels_cover_toxic_labels():
+    assert optimized_toxicity.missing_toxic_labels(UNBIASED_LABELS) == []
+
+
+def test_jigsaw_labels_are_not_renamed():
+    missing = optimized_toxicity.missing_toxic_labels(JIGSAW_LABELS)
+    assert "toxicity" in missing
+    assert "sexual_explicit" in missing
+
+
+def test_scan_matches_toxicity():
+    scanner = optimized_toxicity.OptimizedToxicity(fake_pipeline)
+    # Skip __init__ so no model is downloaded; scan() only needs these attributes
+    reference = toxicity.Toxicity.__new__(toxicity.Toxicity)
+    reference._pipeline = fake_pipeline
+    reference._threshold = 0.5
+    reference._match_type = toxicity.MatchType.FULL
+    for prompt in list(PIPELINE_OUTPUT) + [""]:
+        assert scanner.scan(prompt) == reference.scan(prompt), prompt
+
+
+def test_loads_optimized_scanner(monkeypatch):
+    monkeypatch.setattr(optimized_toxicity, "load_optimized_model", lambda: fake_model(UNBIASED_LABELS))
+    monkeypatch.setattr(optimized_toxicity, "build_pipeline", lambda model: fake_pipeline)
+    scanner = optimized_toxicity.load_toxicity_scanner()
+    assert isinstance(scanner, optimized_toxicity.OptimizedToxicity)
+    assert scanner._pipeline is fake_pipeline
+
+
+def test_falls_back_on_missing_labels(monkeypatch):
+    monkeypatch.setattr(optimized_toxicity, "load_optimized_model", lambda: fake_model(JIGSAW_LABELS))
+    monkeypatch.setattr(optimized_toxicity, "Toxicity", StockToxicity)
+    scanner = optimized_toxicity.load_toxicity_scanner()
+    assert isinstance(scanner, StockToxicity)
+    assert scanner.kwargs == {"use_onnx": True}
+
+
+def test_falls_back_when_model_fails_to_load(monkeypatch):
+    def unavailable():
+        raise OSError("model_optimized.onnx not found")
+
+    monkeypatch.setattr(optimized_toxicity, "load_optimized_model", unavailable)
+    monkeypatch.setattr(optimized_toxicity, "Toxicity", StockToxicity)
+    assert isinstance(optimized_toxicity.load_toxicity_scanner(), StockToxicity)
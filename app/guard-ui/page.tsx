@@ -476,11 +476,15 @@ export default function GuardScannerPage() {
                       (s) => s.id === result.scanner_name
                     );
                     const riskMeta = getRiskLevel(result.risk_score);
+                    // Not run because an earlier scanner blocked the prompt
+                    const skipped = result.details.skipped === true;
                     return (
                       <div
                         key={index}
                         className={`p-5 border rounded-lg shadow-lg ${
-                          result.is_valid
+                          skipped
+                            ? "border-gray-700 opacity-60"
+                            : result.is_valid
                             ? "border-gray-600"
                             : "border-red-500 bg-red-900 bg-opacity-20"
                         } bg-gray-750`}
@@ -491,12 +495,18 @@ export default function GuardScannerPage() {
                           </h4>
                           <span
                             className={`inline-block px-4 py-1.5 text-xs font-bold text-white rounded-full border-2 ${
-                              result.is_valid
+                              skipped
+                                ? "bg-gray-600 border-gray-500"
+                                : result.is_valid
                                 ? "bg-green-600 border-green-500"
                                 : "bg-red-600 border-red-500"
                             }`}
                           >
-                            {result.is_valid ? "VALID" : "INVALID"}
+                            {skipped
+                              ? "SKIPPED"
+                              : result.is_valid
+                              ? "VALID"
+                              : "INVALID"}
                           </span>
                         </div>
 
@@ -505,11 +515,17 @@ export default function GuardScannerPage() {
                             <span className="font-semibold text-gray-400 block mb-0.5">
                               Risk Score:
                             </span>
-                            <span
-                              className={`font-bold text-lg ${riskMeta.color}`}
-                            >
-                              {result.risk_score.toFixed(2)} ({riskMeta.level})
-                            </span>
+                            {skipped ? (
+                              <span className="font-bold text-lg text-gray-400">
+                                Not scanned
+                              </span>
+                            ) : (
+                              <span
+                                className={`font-bold text-lg ${riskMeta.color}`}
+                              >
+                                {result.risk_score.toFixed(2)} ({riskMeta.level})
+                              </span>
+                            )}
                           </div>
                           <div>
                             <span className="font-semibold text-gray-400 block mb-0.5">
@@ -533,12 +549,14 @@ export default function GuardScannerPage() {
                             </span>
                             <span
                               className={`font-bold text-lg ${
-                                result.is_valid
+                                skipped
+                                  ? "text-gray-400"
+                                  : result.is_valid
                                   ? "text-green-400"
                                   : "text-red-400"
                               }`}
                             >
-                              {result.is_valid ? "Yes" : "No"}
+                              {skipped ? "Skipped" : result.is_valid ? "Yes" : "No"}
                             </span>
                           </div>
                           {Object.keys(result.details).length > 0 && (
@@ -0,0 +1,141 @@
+"""
+Scanner subclasses that swap llm_guard's per-pattern matching for single-pass automata.
+Kept out of main.py so importing them (and llm_guard) only happens when a scanner is first built.
+"""
+import ahocorasick
+import hyperscan
+import threading
+from typing import Any, List, Optional, Tuple
+from llm_guard.input_scanners import BanSubstrings
+from llm_guard.input_scanners.ban_substrings import MatchType
+from llm_guard.input_scanners.regex import MatchType as RegexMatchType, Regex
+
+def is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+class AhoCorasickBanSubstrings(BanSubstrings):
+    """
+    BanSubstrings that finds every banned substring in a single pass over the prompt,
+    using one Aho-Corasick automaton instead of one search per substring.
+    Verdicts, risk scores and redaction are identical to the base scanner's.
+    """
+    def __init__(
+        self,
+        substrings: List[str],
+        match_type: str = "str",
+        case_sensitive: bool = False,
+        redact: bool = False,
+        contains_all: bool = False,
+    ):
+        super().__init__(
+            substrings=substrings,
+            match_type=match_type,
+            case_sensitive=case_sensitive,
+            redact=redact,
+            contains_all=contains_all,
+        )
+        # contains_all needs every substring to be present, which the base scanner already handles;
+        # an empty substring can't be added to the automaton
+        self._use_automaton = bool(substrings) and all(substrings) and not contains_all
+
+        self._automaton = ahocorasick.Automaton()
+        for substring in substrings:
+            key = self._key(substring)
+            self._automaton.add_word(key, key)
+        self._automaton.make_automaton()
+
+    def _key(self, substring: str) -> str:
+        return substring if self._case_sensitive else substring.lower()
+
+    def _is_word_boundary(self, text: str, index: int) -> bool:
+        # Mirrors regex \b: word-ness of the characters on either side differs
+        before = index > 0 and is_word_char(text[index - 1])
+        after = index < len(text) and is_word_char(text[index])
+        return before != after
+
+    def scan(self, prompt: str) -> Tuple[str, bool, float]:
+        if not self._use_automaton:
+            return super().scan(prompt)
+
+        haystack = self._key(prompt)
+        match_words = self._match_type == MatchType.WORD
+        found = set()
+        for end_index, key in self._automaton.iter(haystack):
+            start, end = end_index - len(key) + 1, end_index + 1
+            if match_words and not (
+                self._is_word_boundary(haystack, start) and self._is_word_boundary(haystack, end)
+            ):
+                continue
+            found.add(key)
+
+        if not found:
+            return prompt, True, 0.0
+        if not self._redact:
+            return prompt, False, 1.0
+
+        # Same substrings, in the same order, as the base scanner passes to its redaction
+        matched_substrings = [key for key in map(self._key, self._substrings) if key in found]
+        return self._redact_text(prompt, matched_substrings), False, 1.0
+
+class HyperscanRegex(Regex):
+    """
+    Regex scanner that compiles all patterns into one Hyperscan database and checks the prompt
+    against all of them in a single pass. Most prompts match nothing and are answered from that
+    pass alone; on a match the base scanner produces the verdict and its first-match redaction.
+
+    Hyperscan's dialect isn't Python's: it reads some patterns differently (e.g. x{,3} as a
+    literal, [[:alpha:]] as a POSIX class, \s without \x1c-\x1f) and would miss what re matches.
+    So the fast path is only taken for patterns the caller has vetted to mean the same in both;
+    anything else, including patterns Hyperscan can't compile, uses the stdlib scanner.
+    """
+    def __init__(
+        self,
+        patterns: List[str],
+        is_blocked: bool = True,
+        match_type: str = "search",
+        redact: bool = True,
+        vetted: bool = False,
+    ):
+        super().__init__(patterns=patterns, is_blocked=is_blocked, match_type=match_type, redact=redact)
+        self._database: Optional[hyperscan.Database] = None
+        # A Hyperscan scratch space can't be shared between concurrent scans
+        self._scratch = threading.local()
+
+        # Fullmatch semantics are anchored per pattern, which the base scanner already does cheaply
+        if not vetted or not patterns or self._match_type != RegexMatchType.SEARCH:
+            return
+        # Only whether something matched is needed, so no start offsets and one report per pattern
+        flags = hyperscan.HS_FLAG_SINGLEMATCH | hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP
+        database = hyperscan.Database()
+        try:
+            database.compile(
+                expressions=[pattern.encode("utf-8") for pattern in patterns],
+                ids=list(range(len(patterns))),
+                elements=len(patterns),
+                flags=[flags] * len(patterns),
+            )
+        except hyperscan.error as e:
+            print(f"Hyperscan could not compile regex patterns, using stdlib re: {e}")
+            return
+        self._database = database
+
+    def scan(self, prompt: str) -> Tuple[str, bool, float]:
+        if self._database is None:
+            return super().scan(prompt)
+
+        scratch = getattr(self._scratch, "value", None)
+        if scratch is None:
+            scratch = self._scratch.value = hyperscan.Scratch(self._database)
+
+        matched = False
+
+        def on_match(pattern_id: int, start: int, end: int, flags: int, context: Any) -> None:
+            nonlocal matched
+            matched = True
+
+        self._database.scan(prompt.encode("utf-8"), match_event_handler=on_match, scratch=scratch)
+
+        if matched:
+            return super().scan(prompt)
+        # Nothing matched: fine for a deny list, a violation for an allow list
+        return (prompt, True, 0.0) if self._is_blocked else (prompt, False, 1.0)
@@ -1,64 +1,38 @@
+import asyncio
+import contextvars
+import dataclasses
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import lru_cache
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
-from typing import List, Literal, Dict, Any, Optional
-from llm_guard.input_scanners import (
-    Anonymize, 
-    Secrets, 
-    Toxicity,
-    BanSubstrings,
-    Code
-)
-from llm_guard.input_scanners.regex import Regex
-from llm_guard.vault import Vault
+from typing import Callable, List, Literal, Dict, Any, Optional, Tuple, Union
+from blake3 import blake3
+from cachetools import LRUCache
 
-# In a real application, you would configure the vault more securely.
-# For this example, we'll use an in-memory vault.
-vault = Vault()
+# Scanner classes (and the llm_guard / transformers / Presidio stack behind them) are imported
+# inside the factories below, so a process only pays the import and model-load cost
+# for the scanners it actually uses.
 
-# Attempt to configure Anonymizer for CPU
-# Define entity types for the custom recognizer
+# Entity types the Anonymize scanner redacts
 ANONYMIZE_ENTITY_TYPES = ["PERSON", "PHONE_NUMBER", "EMAIL_ADDRESS", "ORGANIZATION"]
 
-# This configuration attempts to force the underlying Hugging Face transformer model 
-# used by Presidio within the Anonymize scanner to run on CPU.
-CPU_RECOGNIZER_CONF = {
-    "nlp_engine_name": "spacy", # Presidio's default NLP engine
-    "models": [{"lang_code": "en", "model_name": "en_core_web_sm"}], # Use a lighter spaCy model for base NER
-    "recognizers": [
-        {
-            "name": "custom_hf_recognizer_cpu",
-            "supported_entities": ANONYMIZE_ENTITY_TYPES,
-            "type": "transformers",
-            "model_path": "Isotonic/deberta-v3-base_finetuned_ai4privacy_v2",
-            "pipeline_kwargs": {"device": "cpu"} # Key change: set device to CPU
-        }
-        # We might need to add other default recognizers Presidio uses if they get overridden,
-        # or ensure this custom one is additive or correctly prioritized.
-    ]
-}
-
-anonymizer_global = Anonymize(
-    vault=vault, 
-    entity_types=ANONYMIZE_ENTITY_TYPES, # Ensure these match what the recognizer supports
-    recognizer_conf=CPU_RECOGNIZER_CONF 
-)
-secrets_scanner_global = Secrets()
-toxicity_scanner_global = Toxicity()
+# INT8 ONNX exports produced by quantize_models.py.
+# Each scanner falls back to its full-precision hub model if they haven't been generated yet.
+MODELS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "models")
+ANONYMIZE_INT8_MODEL_DIR = os.path.join(MODELS_DIR, "anonymize-int8")
+CODE_INT8_MODEL_DIR = os.path.join(MODELS_DIR, "code-int8")
 
 # Example sensitive substrings - in a real app, this would be configurable
 BANNED_SUBSTRINGS = ["Project Chimera", "Q4_Roadmap_Internal_Draft", "CONFIDENTIAL_DO_NOT_SHARE"]
-ban_substrings_scanner_global = BanSubstrings(
-    substrings=BANNED_SUBSTRINGS, 
-    match_type="word",
-    case_sensitive=False,
-    redact=True
-)
 
 # Example regex pattern for internal document IDs
 # In a real app, this would be configurable and more extensive
 INTERNAL_DOC_ID_PATTERN = r"INTDOC-\d{6}-[A-Z]{3}"
-regex_scanner_global = Regex(patterns=[INTERNAL_DOC_ID_PATTERN], is_blocked=True, match_type="search")
 
 # Specify languages for the Code scanner, ensuring they are in the scanner's supported list
 # From llm_guard.input_scanners.code.SUPPORTED_LANGUAGES
@@ -68,9 +42,216 @@ CORRECTED_CODE_LANGUAGES = [
     "Perl", "Python", "R", "Ruby", "Rust", "Scala", "Swift"
     # We can add more from the supported list if desired, e.g., 'C#', 'PowerShell'
 ]
-code_scanner_global = Code(languages=CORRECTED_CODE_LANGUAGES)
 
-app = FastAPI()
+# Worker processes actually serving the app. uvicorn takes its default worker count from
+# WEB_CONCURRENCY (1 if unset), and __main__ exports the count it starts, so this holds for both
+# `python main.py` and `uvicorn main:app` (use WEB_CONCURRENCY=N rather than --workers N there).
+# Each worker has its own scanners and pool, so thread counts below are sized from this worker's
+# share of the cores, not the whole machine.
+CPU_COUNT = os.cpu_count() or 1
+WORKER_PROCESSES = max(1, int(os.environ.get("WEB_CONCURRENCY", 1)))
+WORKER_CORES = max(1, CPU_COUNT // WORKER_PROCESSES)
+
+# The toxicity session serves the dynamic batcher, which runs one batch at a time on its own
+# thread, outside the scanner pool. Half of the worker's cores are set aside for it.
+BATCHED_INTRA_OP_THREADS = max(1, WORKER_CORES // 2)
+POOL_CORES = max(1, WORKER_CORES - BATCHED_INTRA_OP_THREADS) # Only a single-core worker overlaps the two
+
+# Scans run at once per worker (the scanner pool's size). Each inference session gets an equal
+# share of the pool's cores, so concurrent requests don't oversubscribe the CPU.
+MAX_CONCURRENT_SCANS = int(os.environ.get("MAX_CONCURRENT_SCANS", POOL_CORES))
+INTRA_OP_THREADS = max(1, POOL_CORES // MAX_CONCURRENT_SCANS)
+
+def tuned_session_options(intra_op_threads: int = INTRA_OP_THREADS) -> Any:
+    import onnxruntime as ort
+
+    options = ort.SessionOptions()
+    options.intra_op_num_threads = intra_op_threads
+    options.inter_op_num_threads = 1
+    options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    # Reuse allocation plans and arena memory across runs instead of reallocating per request
+    options.enable_mem_pattern = True
+    options.enable_cpu_mem_arena = True
+    return options
+
+def tune_model_threads(model: Any, intra_op_threads: int = INTRA_OP_THREADS) -> None:
+    """
+    Caps the thread pool of a pipeline's model. ONNX Runtime sessions can't be reconfigured,
+    so they are rebuilt from the same file with tuned options. PyTorch models share one
+    process-wide setting, which stays at the per-scan share whatever intra_op_threads asks for.
+    """
+    session = getattr(model, "model", None)
+    model_path = getattr(session, "_model_path", None)
+    if model_path is not None and hasattr(session, "get_providers"):
+        import onnxruntime as ort
+        model.model = ort.InferenceSession(
+            model_path, tuned_session_options(intra_op_threads), providers=session.get_providers()
+        )
+    else:
+        import torch
+        torch.set_num_threads(INTRA_OP_THREADS)
+
+def create_anonymize_scanner():
+    from llm_guard.input_scanners import Anonymize
+    from llm_guard.vault import Vault
+
+    recognizer_conf = None # llm_guard's default recognizer (DeBERTa ai4privacy v2 from the hub)
+    use_onnx = os.path.isdir(ANONYMIZE_INT8_MODEL_DIR)
+    if use_onnx:
+        from llm_guard.input_scanners.anonymize_helpers import DEBERTA_AI4PRIVACY_v2_CONF
+
+        # Same recognizer configuration, with the model loaded from the local INT8 export
+        recognizer_conf = {
+            **DEBERTA_AI4PRIVACY_v2_CONF,
+            "DEFAULT_MODEL": dataclasses.replace(
+                DEBERTA_AI4PRIVACY_v2_CONF["DEFAULT_MODEL"],
+                path=ANONYMIZE_INT8_MODEL_DIR,
+                subfolder="",
+                revision=None,
+                onnx_path=ANONYMIZE_INT8_MODEL_DIR,
+                onnx_subfolder="",
+                onnx_revision=None,
+                onnx_filename="model_quantized.onnx",
+            ),
+        }
+
+    # In a real application, you would configure the vault more securely.
+    # For this example, we'll use an in-memory vault.
+    scanner = Anonymize(
+        vault=Vault(), 
+        entity_types=ANONYMIZE_ENTITY_TYPES, # Ensure these match what the recognizer supports
+        recognizer_conf=recognizer_conf,
+        use_onnx=use_onnx,
+    )
+    # The NER transformer lives on a Presidio recognizer inside the scanner's analyzer
+    registry = getattr(getattr(scanner, "_analyzer", None), "registry", None)
+    for recognizer in getattr(registry, "recognizers", []):
+        pipeline = getattr(recognizer, "pipeline", None)
+        if pipeline is not None:
+            tune_model_threads(pipeline.model)
+    return scanner
+
+def create_secrets_scanner():
+    from llm_guard.input_scanners import Secrets
+    return Secrets()
+
+def create_toxicity_scanner():
+    from llm_guard.input_scanners import Toxicity
+    # ONNX, so the batched session can have its own thread count (PyTorch's is process-wide)
+    scanner = Toxicity(use_onnx=True)
+    tune_model_threads(scanner._pipeline.model, BATCHED_INTRA_OP_THREADS)
+    return scanner
+
+def create_ban_substrings_scanner(substrings: Optional[List[str]] = None):
+    from custom_scanners import AhoCorasickBanSubstrings
+    return AhoCorasickBanSubstrings(
+        substrings=BANNED_SUBSTRINGS if substrings is None else substrings, 
+        match_type="word",
+        case_sensitive=False,
+        redact=True
+    )
+
+def create_regex_scanner(patterns: Optional[List[str]] = None):
+    from custom_scanners import HyperscanRegex
+    return HyperscanRegex(
+        patterns=[INTERNAL_DOC_ID_PATTERN] if patterns is None else patterns,
+        is_blocked=True,
+        match_type="search",
+        # Only the built-in pattern is known to mean the same to Hyperscan and re;
+        # client-supplied patterns are matched with re alone
+        vetted=patterns is None,
+    )
+
+def create_code_scanner():
+    from llm_guard.input_scanners import Code
+    from llm_guard.input_scanners.code import DEFAULT_MODEL
+
+    if os.path.isdir(CODE_INT8_MODEL_DIR):
+        # Same classifier and pipeline settings, loaded from the local INT8 export
+        model = dataclasses.replace(
+            DEFAULT_MODEL,
+            path=CODE_INT8_MODEL_DIR,
+            subfolder="",
+            revision=None,
+            onnx_path=CODE_INT8_MODEL_DIR,
+            onnx_subfolder="",
+            onnx_revision=None,
+            onnx_filename="model_quantized.onnx",
+        )
+        scanner = Code(languages=CORRECTED_CODE_LANGUAGES, model=model, use_onnx=True)
+    else:
+        scanner = Code(languages=CORRECTED_CODE_LANGUAGES)
+    tune_model_threads(scanner._pipeline.model)
+    return scanner
+
+# A failure from one of these already makes the request invalid (e.g. a leaked internal doc ID),
+# so the assessment scanners, the expensive ML ones, are skipped. The remaining redactors still
+# run, so nothing they would have removed is left in the final prompt.
+BLOCKING_SCANNERS = {"regex", "bansubstrings"}
+
+# Shared pool for the blocking scanner.scan() calls so ML inference doesn't stall the event loop
+scanner_pool = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_SCANS, thread_name_prefix="scan")
+
+# Backpressure: at most this many scans may be running or queued on the pool; further callers
+# wait on the event loop instead of piling work (and inference memory) onto the executor.
+scan_semaphore = asyncio.Semaphore(MAX_CONCURRENT_SCANS * 2)
+
+async def run_in_pool(fn: Callable, *args: Any) -> Any:
+    """
+    Runs fn(*args) on the scanner pool, waiting for a free slot first.
+    """
+    async with scan_semaphore:
+        return await asyncio.get_running_loop().run_in_executor(scanner_pool, fn, *args)
+
+# Shared scanner instances, filled in by get_scanner()
+scanners: Dict[str, Any] = {}
+
+# One lock per scanner name serialises its first-time construction, so concurrent requests
+# don't load the same model twice while other scanners stay usable (or loadable) meanwhile
+scanner_init_locks: Dict[str, threading.Lock] = {}
+scanner_init_locks_guard = threading.Lock()
+
+def get_scanner(name: str) -> Any:
+    """
+    Returns the shared instance of the named scanner, constructing it on first use.
+    """
+    # Lock-free fast path once the scanner exists; dict reads are atomic under the GIL
+    scanner = scanners.get(name)
+    if scanner is not None:
+        return scanner
+    with scanner_init_locks_guard:
+        init_lock = scanner_init_locks.setdefault(name, threading.Lock())
+    with init_lock:
+        scanner = scanners.get(name)
+        if scanner is None:
+            scanner = scanners[name] = AVAILABLE_SCANNERS_GLOBAL[name]()
+        return scanner
+
+# Scanners built at startup so the first request doesn't pay for them; the rest load on demand.
+# The UI selects only "anonymize" by default.
+PRELOAD_SCANNERS = [
+    name.strip() for name in os.environ.get("PRELOAD_SCANNERS", "anonymize").split(",") if name.strip()
+]
+
+# Approximate prompt lengths (in tokens) run through each preloaded scanner at startup, so the
+# inference runtime selects kernels for each shape class and grows its memory arena before
+# the first real request pays for it.
+WARMUP_TOKEN_LENGTHS = [16, 64, 256, 1024]
+
+def warm_up_scanner(name: str) -> None:
+    scanner = get_scanner(name)
+    for length in WARMUP_TOKEN_LENGTHS:
+        scanner.scan("warmup " * length) # Straight to the scanner, bypassing the scan cache
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    for name in PRELOAD_SCANNERS:
+        await run_in_pool(warm_up_scanner, name)
+    yield
+
+# orjson serialises responses in C; Response sets Content-Length from the encoded body
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
 # CORS configuration
 origins = [
@@ -106,6 +287,8 @@ class ComprehensiveScanRequest(BaseModel):
     banned_substrings_list: Optional[List[str]] = None
     regex_patterns_list: Optional[List[str]] = None
 
+# Results are built from trusted scanner output with model_construct, skipping per-field
+# validation on the hot path; FastAPI still validates the response once against response_model.
 class SingleScannerResult(BaseModel):
     scanner_name: ScannerName
     input_prompt: str # The prompt as it was fed into THIS scanner
@@ -120,103 +303,309 @@ class ComprehensiveScanResponse(BaseModel):
     overall_is_valid: bool
     applied_scanners_results: List[SingleScannerResult]
 
-# Allows calling scanners by name and defines a default processing order
-# Order can matter: e.g., anonymize before toxicity check on the anonymized text.
-AVAILABLE_SCANNERS_GLOBAL: Dict[ScannerName, Any] = {
-    "anonymize": anonymizer_global,
-    "bansubstrings": ban_substrings_scanner_global,
-    "regex": regex_scanner_global, 
-    "secrets": secrets_scanner_global,
-    "toxicity": toxicity_scanner_global,
-    "code": code_scanner_global,
+# Allows building scanners by name; instances are created lazily through get_scanner()
+AVAILABLE_SCANNERS_GLOBAL: Dict[ScannerName, Callable[[], Any]] = {
+    "anonymize": create_anonymize_scanner,
+    "bansubstrings": create_ban_substrings_scanner,
+    "regex": create_regex_scanner, 
+    "secrets": create_secrets_scanner,
+    "toxicity": create_toxicity_scanner,
+    "code": create_code_scanner,
 }
 
-# Define a preferred order of execution for scanners that modify content vs. those that assess
-# Scanners that redact/modify should generally go first.
-SCANNER_EXECUTION_ORDER: List[ScannerName] = [
+# Scanners that may redact/modify the prompt run first, strictly in this order,
+# each one feeding its output into the next.
+MUTATING_SCANNERS: List[ScannerName] = [
     "anonymize", 
     "bansubstrings", 
     "regex",       # Can block, so run before non-blocking assessment scanners
+]
+
+# Scanners that only assess the (already redacted) prompt. They don't depend on
+# each other, so they are fanned out concurrently against the same input.
+ASSESSMENT_SCANNERS: List[ScannerName] = [
     "secrets",     # Detects, doesn't modify by default in our setup
     "toxicity",    # Assesses
     "code"         # Assesses
 ]
 
+ScanOutcome = Tuple[str, bool, float]
+
+# Process-local memo of (prompt, scanner) -> outcome for the model-backed scanners, so repeated or
+# retried prompts skip inference entirely. The pattern-based scanners (bansubstrings, regex,
+# secrets) scan about as fast as the hash and lock would cost, so they aren't cached and don't
+# compete for slots.
+CACHED_SCANNERS = {"anonymize", "toxicity", "code"}
+SCAN_CACHE_SIZE = 4096
+scan_cache: LRUCache = LRUCache(maxsize=SCAN_CACHE_SIZE)
+scan_cache_lock = threading.Lock() # LRUCache isn't thread-safe and scans run on the pool
+
+def scan_cache_key(scanner_name: str, prompt: str) -> bytes:
+    return blake3(prompt.encode("utf-8")).digest()[:16] + scanner_name.encode("utf-8")
+
+def cached_outcome(scanner_name: str, prompt: str) -> Optional[ScanOutcome]:
+    with scan_cache_lock:
+        return scan_cache.get(scan_cache_key(scanner_name, prompt))
+
+def store_outcome(scanner_name: str, prompt: str, outcome: ScanOutcome) -> None:
+    with scan_cache_lock:
+        scan_cache[scan_cache_key(scanner_name, prompt)] = outcome
+
+def scan_with_cache(scanner_name: str, prompt: str) -> ScanOutcome:
+    """
+    Runs the shared scanner for scanner_name on prompt, reusing a previous outcome when there is one.
+    """
+    if scanner_name not in CACHED_SCANNERS:
+        return get_scanner(scanner_name).scan(prompt)
+    outcome = cached_outcome(scanner_name, prompt)
+    if outcome is None:
+        outcome = get_scanner(scanner_name).scan(prompt)
+        store_outcome(scanner_name, prompt, outcome)
+    return outcome
+
+class DynamicBatcher:
+    """
+    Coalesces concurrent single-prompt requests into one batched model call.
+    Prompts arriving within max_wait_ms of each other (up to max_batch_size) are
+    handed to batch_fn together, and each caller gets back its own result.
+    Batches run one at a time on the batcher's own thread, not on the scanner pool.
+    """
+    def __init__(
+        self,
+        batch_fn: Callable[[List[str]], List[ScanOutcome]],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 10,
+    ):
+        self._batch_fn = batch_fn
+        self._max_batch_size = max_batch_size
+        self._max_wait = max_wait_ms / 1000
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="batch")
+        # Created lazily so they bind to the running event loop
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    async def submit(self, prompt: str) -> ScanOutcome:
+        if self._worker is None:
+            self._queue = asyncio.Queue()
+            # The worker outlives the request that starts it, so it gets an empty context
+            # instead of a copy of that request's context variables
+            self._worker = contextvars.Context().run(asyncio.create_task, self._run())
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((prompt, future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self._max_wait
+            while len(batch) < self._max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            prompts = [prompt for prompt, _ in batch]
+            try:
+                outcomes = await loop.run_in_executor(self._executor, self._batch_fn, prompts)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for (_, future), outcome in zip(batch, outcomes):
+                if not future.done():
+                    future.set_result(outcome)
+
+TOXICITY_BATCH_SIZE = 32
+
+# The default toxicity model also scores identity mentions (e.g. "female", "muslim");
+# only these labels count towards the toxicity verdict.
+TOXIC_LABELS = {
+    "toxicity", "severe_toxicity", "obscene", "threat", "insult", "identity_attack", "sexual_explicit"
+}
+
+def scan_toxicity_batch(prompts: List[str]) -> List[ScanOutcome]:
+    """
+    Batched equivalent of Toxicity.scan: runs every prompt through a single pipeline call.
+    """
+    from llm_guard.util import calculate_risk_score
+
+    scanner = get_scanner("toxicity")
+    outcomes: List[Optional[ScanOutcome]] = [None] * len(prompts)
+    inputs: List[str] = []
+    owners: List[int] = [] # Index of the prompt each pipeline input belongs to
+    for i, prompt in enumerate(prompts):
+        if prompt.strip() == "":
+            outcomes[i] = (prompt, True, 0.0)
+            continue
+        for chunk in scanner._match_type.get_inputs(prompt):
+            inputs.append(chunk)
+            owners.append(i)
+
+    highest_scores: Dict[int, float] = {i: 0.0 for i in owners}
+    if inputs:
+        pipeline_results = scanner._pipeline(inputs, batch_size=TOXICITY_BATCH_SIZE, truncation="only_first")
+        for owner, labels in zip(owners, pipeline_results):
+            if isinstance(labels, dict): # Pipeline configured without top_k returns just the top label
+                labels = [labels]
+            for label in labels:
+                if label["label"] not in TOXIC_LABELS:
+                    continue
+                highest_scores[owner] = max(highest_scores[owner], label["score"])
+
+    for i, score in highest_scores.items():
+        if score > scanner._threshold:
+            outcomes[i] = (prompts[i], False, calculate_risk_score(score, scanner._threshold))
+        else:
+            outcomes[i] = (prompts[i], True, 0.0)
+    return outcomes
+
+# Anonymize goes through Presidio's analyzer, which has no batched entry point, so only toxicity is batched
+toxicity_batcher = DynamicBatcher(scan_toxicity_batch, max_batch_size=TOXICITY_BATCH_SIZE)
+
+# Request-specific scanners are cached by their configuration, so clients that send the same
+# list every time don't rebuild the automaton or recompile the Hyperscan database per request.
+OVERRIDE_SCANNER_CACHE_SIZE = 64
+
+@lru_cache(maxsize=OVERRIDE_SCANNER_CACHE_SIZE)
+def ban_substrings_override(substrings: Tuple[str, ...]) -> Any:
+    return create_ban_substrings_scanner(list(substrings))
+
+@lru_cache(maxsize=OVERRIDE_SCANNER_CACHE_SIZE)
+def regex_override(patterns: Tuple[str, ...]) -> Any:
+    return create_regex_scanner(list(patterns))
+
+def build_request_override(scanner_name: ScannerName, request: ComprehensiveScanRequest) -> Optional[Any]:
+    """
+    Returns the scanner for request-specific configuration, or None to use the shared one.
+    """
+    if scanner_name == "bansubstrings" and request.banned_substrings_list is not None:
+        return ban_substrings_override(tuple(request.banned_substrings_list))
+    if scanner_name == "regex" and request.regex_patterns_list is not None:
+        return regex_override(tuple(request.regex_patterns_list))
+    return None
+
+def scan_outcome(scanner_name: ScannerName, request: ComprehensiveScanRequest, input_prompt: str) -> ScanOutcome:
+    """
+    Runs one scanner for a comprehensive request. Called on the scanner pool, since the
+    shared scanner may load its model on first use.
+    """
+    override = build_request_override(scanner_name, request)
+    if override is not None:
+        return override.scan(input_prompt)
+    return scan_with_cache(scanner_name, input_prompt)
+
+async def scan_toxicity_batched(prompt: str) -> ScanOutcome:
+    """
+    Scans a prompt for toxicity, sharing a forward pass with any concurrent toxicity scans.
+    """
+    outcome = cached_outcome("toxicity", prompt)
+    if outcome is None:
+        outcome = await toxicity_batcher.submit(prompt)
+        store_outcome("toxicity", prompt, outcome)
+    return outcome
+
+def build_result(
+    scanner_name: ScannerName, input_prompt: str, outcome: Union[ScanOutcome, BaseException]
+) -> SingleScannerResult:
+    """
+    Wraps a scanner's outcome (or the exception it raised) in a SingleScannerResult.
+    """
+    if isinstance(outcome, BaseException):
+        print(f"Error during {scanner_name} scan: {outcome}") # Log the error
+        # How to handle scanner failure? For now, assume it's invalid, max risk, no change to prompt
+        return SingleScannerResult.model_construct(
+            scanner_name=scanner_name,
+            input_prompt=input_prompt, 
+            sanitized_prompt=input_prompt,
+            is_valid=False,
+            risk_score=1.0, # Max risk for scanner failure
+            details={"error": str(outcome)} 
+        )
+
+    sanitized_prompt, is_valid, risk_score = outcome
+    return SingleScannerResult.model_construct(
+        scanner_name=scanner_name,
+        input_prompt=input_prompt, 
+        sanitized_prompt=sanitized_prompt,
+        is_valid=is_valid,
+        risk_score=risk_score
+    )
+
 @app.post("/scan/comprehensive", response_model=ComprehensiveScanResponse)
 async def scan_comprehensive_prompt(request: ComprehensiveScanRequest):
     original_prompt = request.prompt
     current_prompt_state = original_prompt
-    overall_is_valid = True
     applied_scanners_results: List[SingleScannerResult] = []
 
-    # Filter and order the requested scanners according to our defined execution order
-    ordered_scanners_to_run = [
-        s_name for s_name in SCANNER_EXECUTION_ORDER if s_name in request.scanners
-    ]
-
-    for scanner_name in ordered_scanners_to_run:
-        scanner_instance = AVAILABLE_SCANNERS_GLOBAL.get(scanner_name)
-        if not scanner_instance:
-            # Should not happen if ScannerName Literal is used correctly by client
-            continue 
-
-        # Override with request-specific configuration if provided
-        if scanner_name == "bansubstrings" and request.banned_substrings_list is not None:
-            scanner_instance = BanSubstrings(
-                substrings=request.banned_substrings_list, 
-                match_type="word",
-                case_sensitive=False,
-                redact=True
-            )
-        elif scanner_name == "regex" and request.regex_patterns_list is not None:
-            scanner_instance = Regex(
-                patterns=request.regex_patterns_list, 
-                is_blocked=True,
-                match_type="search"
-            )
+    blocked_by: Optional[ScannerName] = None
 
-        input_for_this_scanner = current_prompt_state
+    # Phase 1: redacting scanners, in order. Output of one becomes input to next.
+    mutating_names = [s_name for s_name in MUTATING_SCANNERS if s_name in request.scanners]
+    assessment_names = [s_name for s_name in ASSESSMENT_SCANNERS if s_name in request.scanners]
+    for scanner_name in mutating_names:
         # Wrap scan call in try-except to catch potential scanner-specific errors
         try:
-            sanitized_prompt, is_valid, risk_score = scanner_instance.scan(input_for_this_scanner)
+            outcome = await run_in_pool(scan_outcome, scanner_name, request, current_prompt_state)
         except Exception as e:
-            print(f"Error during {scanner_name} scan: {e}") # Log the error
-            # How to handle scanner failure? For now, assume it's invalid, 0 score, no change to prompt
-            sanitized_prompt = input_for_this_scanner 
-            is_valid = False
-            risk_score = 1.0 # Max risk for scanner failure
-            # Optionally add error details to the result
+            outcome = e
+        result = build_result(scanner_name, current_prompt_state, outcome)
+        applied_scanners_results.append(result)
+        current_prompt_state = result.sanitized_prompt
+
+        # Only a real finding blocks; if the scanner itself failed, the assessments still run
+        if (
+            blocked_by is None
+            and not result.is_valid
+            and scanner_name in BLOCKING_SCANNERS
+            and "error" not in result.details
+        ):
+            blocked_by = scanner_name
+
+    if blocked_by is not None:
+        # Report the scanners we didn't run. They weren't passed, so they aren't marked valid;
+        # details tells the client they were skipped rather than failed.
+        for skipped_name in assessment_names:
             applied_scanners_results.append(
-                SingleScannerResult(
-                    scanner_name=scanner_name,
-                    input_prompt=input_for_this_scanner, 
-                    sanitized_prompt=sanitized_prompt,
-                    is_valid=is_valid,
-                    risk_score=risk_score,
-                    details={"error": str(e)} 
+                SingleScannerResult.model_construct(
+                    scanner_name=skipped_name,
+                    input_prompt=current_prompt_state,
+                    sanitized_prompt=current_prompt_state,
+                    is_valid=False,
+                    risk_score=0.0,
+                    details={"skipped": True, "blocked_by": blocked_by}
                 )
             )
-            current_prompt_state = sanitized_prompt
-            overall_is_valid = False
-            continue # Move to the next scanner or finish
-        
-        applied_scanners_results.append(
-            SingleScannerResult(
-                scanner_name=scanner_name,
-                input_prompt=input_for_this_scanner, 
-                sanitized_prompt=sanitized_prompt,
-                is_valid=is_valid,
-                risk_score=risk_score
-            )
-        )
-        
-        current_prompt_state = sanitized_prompt # Output of one becomes input to next
-        if not is_valid:
-            overall_is_valid = False
-            # Optional: decide if we should stop processing further scanners if one fails decisively
-            # For now, we'll run all selected scanners to get all findings, but overall_is_valid will reflect any failure.
-
-    return ComprehensiveScanResponse(
+        assessment_names = []
+
+    # Phase 2: assessment scanners, fanned out concurrently on the redacted prompt.
+    # Kept as parallel arrays (name, input, outcome) so the whole phase is one batch: toxicity
+    # joins the shared batcher's forward pass, the rest go to the scanner pool.
+    assessment_inputs = [current_prompt_state] * len(assessment_names)
+    assessment_outcomes = await asyncio.gather(
+        *[
+            scan_toxicity_batched(prompt) if s_name == "toxicity"
+            else run_in_pool(scan_outcome, s_name, request, prompt)
+            for s_name, prompt in zip(assessment_names, assessment_inputs)
+        ],
+        return_exceptions=True,
+    )
+    for s_name, prompt, outcome in zip(assessment_names, assessment_inputs, assessment_outcomes):
+        result = build_result(s_name, prompt, outcome)
+        applied_scanners_results.append(result)
+        # Assessors normally echo their input; keep any redaction one of them did apply (e.g. secrets)
+        if result.sanitized_prompt != prompt:
+            current_prompt_state = result.sanitized_prompt
+
+    # Unless a blocking scanner fails, we run all selected scanners to get all findings;
+    # overall_is_valid reflects any failure.
+    overall_is_valid = all(result.is_valid for result in applied_scanners_results)
+
+    return ComprehensiveScanResponse.model_construct(
         original_prompt=original_prompt,
         final_sanitized_prompt=current_prompt_state,
         overall_is_valid=overall_is_valid,
@@ -228,7 +617,7 @@ async def scan_anonymize_prompt_individual(request: ScanRequest):
     """
     Scans a prompt using the Anonymize scanner to remove PII.
     """
-    sanitized_prompt, is_valid, risk_score = anonymizer_global.scan(request.prompt)
+    sanitized_prompt, is_valid, risk_score = await run_in_pool(scan_with_cache, "anonymize", request.prompt)
     
     return ScanResponse(
         sanitized_prompt=sanitized_prompt,
@@ -241,7 +630,7 @@ async def scan_secrets_prompt_individual(request: ScanRequest):
     """
     Scans a prompt using the Secrets scanner.
     """
-    sanitized_prompt, is_valid, risk_score = secrets_scanner_global.scan(request.prompt)
+    sanitized_prompt, is_valid, risk_score = await run_in_pool(scan_with_cache, "secrets", request.prompt)
     return ScanResponse(
         sanitized_prompt=sanitized_prompt, # Secrets scanner might not change the prompt by default
         is_valid=is_valid,
@@ -253,7 +642,7 @@ async def scan_toxicity_prompt_individual(request: ScanRequest):
     """
     Scans a prompt using the Toxicity scanner.
     """
-    sanitized_prompt, is_valid, risk_score = toxicity_scanner_global.scan(request.prompt)
+    sanitized_prompt, is_valid, risk_score = await scan_toxicity_batched(request.prompt)
     return ScanResponse(
         sanitized_prompt=sanitized_prompt, # Toxicity scanner doesn't change the prompt
         is_valid=is_valid,
@@ -265,7 +654,7 @@ async def scan_ban_substrings_prompt_individual(request: ScanRequest):
     """
     Scans a prompt using the BanSubstrings scanner.
     """
-    sanitized_prompt, is_valid, risk_score = ban_substrings_scanner_global.scan(request.prompt)
+    sanitized_prompt, is_valid, risk_score = await run_in_pool(scan_with_cache, "bansubstrings", request.prompt)
     return ScanResponse(sanitized_prompt=sanitized_prompt, is_valid=is_valid, risk_score=risk_score)
 
 @app.post("/scan/regex", response_model=ScanResponse)
@@ -273,7 +662,7 @@ async def scan_regex_prompt_individual(request: ScanRequest):
     """
     Scans a prompt using the Regex scanner for custom patterns.
     """
-    sanitized_prompt, is_valid, risk_score = regex_scanner_global.scan(request.prompt)
+    sanitized_prompt, is_valid, risk_score = await run_in_pool(scan_with_cache, "regex", request.prompt)
     return ScanResponse(sanitized_prompt=sanitized_prompt, is_valid=is_valid, risk_score=risk_score)
 
 @app.post("/scan/code", response_model=ScanResponse)
@@ -281,7 +670,7 @@ async def scan_code_prompt_individual(request: ScanRequest):
     """
     Scans a prompt using the Code scanner to detect source code.
     """
-    sanitized_prompt, is_valid, risk_score = code_scanner_global.scan(request.prompt)
+    sanitized_prompt, is_valid, risk_score = await run_in_pool(scan_with_cache, "code", request.prompt)
     return ScanResponse(
         sanitized_prompt=sanitized_prompt, # Prompt is usually unchanged unless it's ALL code and fails a threshold
         is_valid=is_valid, 
@@ -293,4 +682,19 @@ if __name__ == "__main__":
     # Running on 0.0.0.0 makes it accessible from the Next.js app
     # if it's running in a container or different network interface.
     # Port 8000 is a common default for dev servers.
-    uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file
+    # uvloop and httptools (both in uvicorn[standard]) replace the stdlib event loop and h11 parser.
+    # Each worker is a separate process with its own scanner instances, so this trades memory
+    # for parallelism around the GIL. Multiple workers require the app as an import string.
+    workers = int(os.environ.get("UVICORN_WORKERS", os.environ.get("WEB_CONCURRENCY", max(1, CPU_COUNT // 2))))
+    # Workers re-import this module; exporting the count lets each size its threads for it
+    os.environ["WEB_CONCURRENCY"] = str(workers)
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        workers=workers,
+        access_log=False,
+    )
+ 
\ No newline at end of file
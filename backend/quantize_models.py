@@ -0,0 +1,52 @@
+"""
+One-off export of the scanner models to ONNX with dynamic INT8 quantization.
+Run once from the backend directory before starting the API:
+
+    python quantize_models.py
+
+main.py picks up the quantized models from ./models when they are present.
+"""
+import os
+from llm_guard.input_scanners.code import DEFAULT_MODEL as CODE_DEFAULT_MODEL
+from optimum.onnxruntime import (
+    ORTModelForSequenceClassification,
+    ORTModelForTokenClassification,
+    ORTQuantizer,
+)
+from optimum.onnxruntime.configuration import AutoQuantizationConfig
+from transformers import AutoTokenizer
+
+MODELS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "models")
+
+ANONYMIZE_MODEL = "Isotonic/deberta-v3-base_finetuned_ai4privacy_v2"
+ANONYMIZE_INT8_DIR = os.path.join(MODELS_DIR, "anonymize-int8")
+
+CODE_MODEL = CODE_DEFAULT_MODEL.path
+CODE_INT8_DIR = os.path.join(MODELS_DIR, "code-int8")
+
+# Dynamic INT8 (no calibration data needed), per-channel, targeting VNNI int8 dot products
+QUANTIZATION_CONFIG = AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=True)
+
+def quantize_anonymize_model():
+    """
+    Exports the Presidio NER transformer to ONNX and writes the INT8 model plus tokenizer.
+    """
+    model = ORTModelForTokenClassification.from_pretrained(ANONYMIZE_MODEL, export=True)
+    quantizer = ORTQuantizer.from_pretrained(model)
+    quantizer.quantize(save_dir=ANONYMIZE_INT8_DIR, quantization_config=QUANTIZATION_CONFIG)
+    AutoTokenizer.from_pretrained(ANONYMIZE_MODEL).save_pretrained(ANONYMIZE_INT8_DIR)
+    print(f"Saved quantized anonymize model to {ANONYMIZE_INT8_DIR}")
+
+def quantize_code_model():
+    """
+    Exports the Code scanner's programming-language classifier to ONNX and writes the INT8 model plus tokenizer.
+    """
+    model = ORTModelForSequenceClassification.from_pretrained(CODE_MODEL, export=True)
+    quantizer = ORTQuantizer.from_pretrained(model)
+    quantizer.quantize(save_dir=CODE_INT8_DIR, quantization_config=QUANTIZATION_CONFIG)
+    AutoTokenizer.from_pretrained(CODE_MODEL).save_pretrained(CODE_INT8_DIR)
+    print(f"Saved quantized code model to {CODE_INT8_DIR}")
+
+if __name__ == "__main__":
+    quantize_anonymize_model()
+    quantize_code_model()
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The backend is run as a script directory (uvicorn "main:app"), not an installed package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,104 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("blake3")
+pytest.importorskip("cachetools")
+
+import main
+
+
+class RedactingScanner:
+    """Rejects prompts containing a substring and redacts it, like the blocking scanners do."""
+
+    def __init__(self, substring):
+        self.substring = substring
+
+    def scan(self, prompt):
+        if self.substring in prompt:
+            return prompt.replace(self.substring, "[REDACTED]"), False, 1.0
+        return prompt, True, 0.0
+
+
+class RecordingScanner:
+    """Passes every prompt and records what it was asked to scan."""
+
+    def __init__(self):
+        self.prompts = []
+
+    def scan(self, prompt):
+        self.prompts.append(prompt)
+        return prompt, True, 0.0
+
+
+class FailingScanner:
+    def scan(self, prompt):
+        raise RuntimeError("scanner crashed")
+
+
+@pytest.fixture
+def scanners(monkeypatch):
+    scanners = {
+        "bansubstrings": RedactingScanner("Project Chimera"),
+        "regex": RedactingScanner("INTDOC-123456-ABC"),
+        "secrets": RecordingScanner(),
+        "code": RecordingScanner(),
+    }
+    monkeypatch.setattr(main, "get_scanner", lambda name: scanners[name])
+    monkeypatch.setattr(main, "scan_cache", main.LRUCache(maxsize=main.SCAN_CACHE_SIZE))
+    return scanners
+
+
+def scan(prompt):
+    request = main.ComprehensiveScanRequest(
+        prompt=prompt, scanners=["bansubstrings", "regex", "secrets", "code"]
+    )
+    return asyncio.run(main.scan_comprehensive_prompt(request))
+
+
+def results_by_name(response):
+    return {result.scanner_name: result for result in response.applied_scanners_results}
+
+
+def test_blocked_prompt_still_runs_every_redactor(scanners):
+    response = scan("Project Chimera is tracked in INTDOC-123456-ABC")
+
+    assert response.final_sanitized_prompt == "[REDACTED] is tracked in [REDACTED]"
+    assert not response.overall_is_valid
+    results = results_by_name(response)
+    assert not results["bansubstrings"].is_valid
+    assert not results["regex"].is_valid
+    assert results["regex"].input_prompt == "[REDACTED] is tracked in INTDOC-123456-ABC"
+
+
+def test_blocked_prompt_skips_assessors(scanners):
+    response = scan("Project Chimera is tracked in INTDOC-123456-ABC")
+
+    results = results_by_name(response)
+    for name in ("secrets", "code"):
+        assert scanners[name].prompts == []
+        assert not results[name].is_valid
+        assert results[name].details == {"skipped": True, "blocked_by": "bansubstrings"}
+
+
+def test_scanner_error_does_not_block(scanners):
+    scanners["bansubstrings"] = FailingScanner()
+    response = scan("Project Chimera is tracked in INTDOC-123456-ABC")
+
+    results = results_by_name(response)
+    assert "error" in results["bansubstrings"].details
+    assert results["regex"].details == {}
+    # Regex still blocks, so the assessors are skipped on its account
+    assert results["secrets"].details == {"skipped": True, "blocked_by": "regex"}
+
+
+def test_valid_prompt_runs_every_scanner(scanners):
+    response = scan("Nothing to see here.")
+
+    assert response.overall_is_valid
+    assert [result.scanner_name for result in response.applied_scanners_results] == [
+        "bansubstrings", "regex", "secrets", "code"
+    ]
+    assert scanners["secrets"].prompts == ["Nothing to see here."]
+    assert all(not result.details for result in response.applied_scanners_results)
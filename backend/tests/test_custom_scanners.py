@@ -0,0 +1,87 @@
+import pytest
+
+pytest.importorskip("ahocorasick")
+pytest.importorskip("hyperscan")
+ban_substrings = pytest.importorskip("llm_guard.input_scanners.ban_substrings")
+regex = pytest.importorskip("llm_guard.input_scanners.regex")
+
+from custom_scanners import AhoCorasickBanSubstrings, HyperscanRegex
+
+SUBSTRINGS = ["Project Chimera", "abc", "bcd", "CONFIDENTIAL_DO_NOT_SHARE", "c++"]
+
+PROMPTS = [
+    "",
+    "Nothing to see here.",
+    "Tell me about Project Chimera.",
+    "Tell me about Project Chimeras.",  # Word match must not fire inside a longer word
+    "project chimera is mixed case, PROJECT CHIMERA too",
+    "abcd",  # Overlapping substrings
+    "abc bcd abc",
+    "xabc abcx _abc",
+    "stamped CONFIDENTIAL_DO_NOT_SHARE and confidential_do_not_share",
+    "I write c++ daily",  # Substring ending in a non-word character
+    "İstanbul abc",  # Lowercasing changes the length
+]
+
+
+@pytest.mark.parametrize("match_type", ["str", "word"])
+@pytest.mark.parametrize("case_sensitive", [False, True])
+@pytest.mark.parametrize("redact", [False, True])
+@pytest.mark.parametrize("contains_all", [False, True])  # contains_all takes the fallback path
+def test_matches_ban_substrings(match_type, case_sensitive, redact, contains_all):
+    options = dict(
+        match_type=match_type, case_sensitive=case_sensitive, redact=redact, contains_all=contains_all
+    )
+    fast = AhoCorasickBanSubstrings(SUBSTRINGS, **options)
+    reference = ban_substrings.BanSubstrings(SUBSTRINGS, **options)
+    for prompt in PROMPTS:
+        assert fast.scan(prompt) == reference.scan(prompt), prompt
+
+
+def test_fallback_for_empty_substring():
+    fast = AhoCorasickBanSubstrings(["", "abc"], redact=True)
+    reference = ban_substrings.BanSubstrings(["", "abc"], redact=True)
+    for prompt in PROMPTS:
+        assert fast.scan(prompt) == reference.scan(prompt), prompt
+
+
+# Built-in style patterns that mean the same to Hyperscan and re
+VETTED_PATTERNS = [r"INTDOC-\d{6}-[A-Z]{3}", r"SSN \d{3}-\d{2}-\d{4}"]
+
+# Patterns Hyperscan reads differently from re, so it would miss matches re finds
+PATTERNS = VETTED_PATTERNS + [r"INTDOC\s\d+", r"x{,3}y", r"[[:alpha:]]"]
+
+REGEX_PROMPTS = [
+    "",
+    "Nothing to see here.",
+    "See INTDOC-123456-ABC for details.",
+    "INTDOC-123456-ABC and INTDOC-654321-XYZ",  # Only the first match is redacted
+    "SSN 123-45-6789, then INTDOC-123456-ABC",  # First pattern in list order wins
+    "café INTDOC-000001-ÉTÉ INTDOC-000002-ABC",  # Non-ASCII text around the match
+    "INTDOC\x1c123",  # re's \s matches \x1c-\x1f, Hyperscan's doesn't
+    "xxy",  # re reads x{,3} as a repeat, Hyperscan as a literal
+    ":]",  # re reads [[:alpha:]] as a character set followed by "]", Hyperscan as a POSIX class
+]
+
+
+@pytest.mark.parametrize("is_blocked", [True, False])
+@pytest.mark.parametrize("redact", [True, False])
+@pytest.mark.parametrize("match_type", ["search", "fullmatch"])
+@pytest.mark.filterwarnings("ignore:Possible nested set:FutureWarning")  # re on [[:alpha:]]
+def test_matches_regex(is_blocked, redact, match_type):
+    options = dict(is_blocked=is_blocked, redact=redact, match_type=match_type)
+    fast = HyperscanRegex(PATTERNS, **options)
+    reference = regex.Regex(PATTERNS, **options)
+    for prompt in REGEX_PROMPTS:
+        assert fast.scan(prompt) == reference.scan(prompt), prompt
+
+
+@pytest.mark.parametrize("is_blocked", [True, False])
+@pytest.mark.parametrize("redact", [True, False])
+def test_vetted_patterns_match_regex(is_blocked, redact):
+    options = dict(is_blocked=is_blocked, redact=redact)
+    fast = HyperscanRegex(VETTED_PATTERNS, vetted=True, **options)
+    assert fast._database is not None  # Takes the Hyperscan path
+    reference = regex.Regex(VETTED_PATTERNS, **options)
+    for prompt in REGEX_PROMPTS:
+        assert fast.scan(prompt) == reference.scan(prompt), prompt
@@ -0,0 +1,50 @@
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("blake3")
+pytest.importorskip("cachetools")
+toxicity = pytest.importorskip("llm_guard.input_scanners.toxicity")
+
+import main
+
+# Canned pipeline output per input: one toxic prompt, one borderline, one identity-only mention
+PIPELINE_OUTPUT = {
+    "you are an idiot": [
+        {"label": "toxicity", "score": 0.97},
+        {"label": "insult", "score": 0.91},
+        {"label": "female", "score": 0.02},
+    ],
+    "that was a stupid movie": [
+        {"label": "toxicity", "score": 0.42},
+        {"label": "insult", "score": 0.12},
+    ],
+    "she is a muslim woman": [
+        {"label": "toxicity", "score": 0.05},
+        {"label": "muslim", "score": 0.93},
+        {"label": "female", "score": 0.88},
+    ],
+}
+
+
+def fake_pipeline(inputs, **kwargs):
+    return [PIPELINE_OUTPUT[text] for text in inputs]
+
+
+@pytest.fixture
+def toxicity_scanner(monkeypatch):
+    # Skip __init__ so no model is downloaded; scan() only needs these attributes
+    scanner = toxicity.Toxicity.__new__(toxicity.Toxicity)
+    scanner._pipeline = fake_pipeline
+    scanner._threshold = 0.5
+    scanner._match_type = toxicity.MatchType.FULL
+    monkeypatch.setattr(main, "get_scanner", lambda name: scanner)
+    return scanner
+
+
+def test_toxic_labels_match_llm_guard():
+    assert main.TOXIC_LABELS == set(toxicity._toxic_labels)
+
+
+def test_batch_matches_toxicity_scan(toxicity_scanner):
+    prompts = list(PIPELINE_OUTPUT) + ["", "   "]
+    assert main.scan_toxicity_batch(prompts) == [toxicity_scanner.scan(prompt) for prompt in prompts]